@@ -0,0 +1,55 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "008_add_submission_lookup_indexes"
+down_revision = "007_add_problem_full_text_search_vector"
+branch_labels = None
+depends_on = None
+
+
+def _index_names(inspector: sa.Inspector, table_name: str) -> set[str]:
+    if table_name not in inspector.get_table_names():
+        return set()
+    return {idx["name"] for idx in inspector.get_indexes(table_name)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    submission_indexes = _index_names(inspector, "submissions")
+    if "ix_submissions_user_id_status" not in submission_indexes:
+        op.create_index(
+            "ix_submissions_user_id_status",
+            "submissions",
+            ["user_id", "status"],
+            unique=False,
+        )
+    if "ix_submissions_user_id_problem_id" not in submission_indexes:
+        op.create_index(
+            "ix_submissions_user_id_problem_id",
+            "submissions",
+            ["user_id", "problem_id"],
+            unique=False,
+        )
+
+    if "discussions" in inspector.get_table_names():
+        if "ix_discussions_problem_id" not in _index_names(inspector, "discussions"):
+            op.create_index(
+                "ix_discussions_problem_id",
+                "discussions",
+                ["problem_id"],
+                unique=False,
+            )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "ix_discussions_problem_id" in _index_names(inspector, "discussions"):
+        op.drop_index("ix_discussions_problem_id", table_name="discussions")
+
+    submission_indexes = _index_names(inspector, "submissions")
+    if "ix_submissions_user_id_problem_id" in submission_indexes:
+        op.drop_index("ix_submissions_user_id_problem_id", table_name="submissions")
+    if "ix_submissions_user_id_status" in submission_indexes:
+        op.drop_index("ix_submissions_user_id_status", table_name="submissions")
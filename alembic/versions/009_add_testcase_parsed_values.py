@@ -0,0 +1,18 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "009_add_testcase_parsed_values"
+down_revision = "008_add_submission_lookup_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("testcases") as batch:
+        batch.add_column(sa.Column("parsed_values", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("testcases") as batch:
+        batch.drop_column("parsed_values")
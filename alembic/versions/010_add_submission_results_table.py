@@ -0,0 +1,42 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = "010_add_submission_results_table"
+down_revision = "009_add_testcase_parsed_values"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "submission_results" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "submission_results",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "submission_id",
+            sa.Integer(),
+            sa.ForeignKey("submissions.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("idx", sa.Integer(), nullable=False),
+        sa.Column("passed", sa.Boolean(), nullable=False),
+        sa.Column("actual_output", sa.Text(), nullable=True),
+        sa.Column("expected_output", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_submission_results_id", "submission_results", ["id"], unique=False)
+    op.create_index(
+        "ix_submission_results_submission_id",
+        "submission_results",
+        ["submission_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_submission_results_submission_id", table_name="submission_results")
+    op.drop_index("ix_submission_results_id", table_name="submission_results")
+    op.drop_table("submission_results")
@@ -1,10 +1,13 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Query
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, Response, status, Query
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from pydantic import ConfigDict, JsonValue, TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import case, delete, distinct, exists, func, or_, select
 from datetime import timedelta
+import functools
 import logging
 import os
 import json
@@ -19,19 +22,21 @@ from config import (
     AZURE_LOCATION,
     AZURE_SUBSCRIPTION_ID,
 )
-from database import init_db, get_db
-from models import User, Problem, Submission, TestCase, Discussion
+from database import init_db, dispose_async_engine, get_db
+from models import User, Problem, Submission, SubmissionResult, TestCase, Discussion
 from schemas import (
     UserCreate, UserResponse, Token,
     ProblemCreate, ProblemResponse, ProblemUpdate,
-    SubmissionCreate, SubmissionResponse, SubmissionWithProblem,
+    SubmissionCreate, SubmissionResponse, SubmissionWithProblem, SubmissionResultResponse,
     TestCaseCreate, TestCaseResponse, LeaderboardEntry,
     DiscussionCreate, DiscussionResponse,
 )
 from auth import (
-    get_password_hash, verify_password, create_access_token,
-    get_current_username_from_token, ACCESS_TOKEN_EXPIRE_MINUTES
+    get_password_hash, verify_and_update_password, create_access_token,
+    get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from celery_app import celery
+from judge_harness import call_style, parse_value
 from tasks import execute_submission
 
 # Setup logging
@@ -43,8 +48,36 @@ _ = (
     AZURE_LOCATION,
 )
 
+# Submission statuses that count as a solved attempt in stats and rankings.
+PASSED_STATUSES = ("accepted", "passed")
+
+# Built once so list endpoints validate and serialize in a single
+# pydantic-core call instead of FastAPI's per-request response handling.
+_problems_adapter = TypeAdapter(list[ProblemResponse])
+_submissions_adapter = TypeAdapter(list[SubmissionResponse])
+# The adapter's own config governs serialization, so it repeats the schema's
+# ser_json_inf_nan setting for non-finite testcase answers.
+_submission_results_adapter = TypeAdapter(
+    list[SubmissionResultResponse],
+    config=ConfigDict(ser_json_inf_nan="strings"),
+)
+_testcases_adapter = TypeAdapter(list[TestCaseResponse])
+_testcase_value_adapter = TypeAdapter(JsonValue)
+
+
+def _list_response(adapter: TypeAdapter, rows: list[Any]) -> Response:
+    """
+    Serialize ORM rows with a prebuilt adapter. Returning a Response skips
+    FastAPI's re-validation; the route's response_model still documents it.
+    """
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(rows)),
+        media_type="application/json",
+    )
+
 
 # Configure CORS origins from environment
+@functools.lru_cache(maxsize=1)
 def get_cors_origins() -> list[str]:
     """
     Get CORS origins from environment variable.
@@ -62,12 +95,18 @@ def get_cors_origins() -> list[str]:
     return origins
 
 
+# Set by the multi-worker entrypoint after it has created and seeded the schema,
+# so workers do not race each other through init_db().
+DB_INITIALIZED_ENV = "CLOUDJUDGE_DB_INITIALIZED"
+
+
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    db_ok = init_db()
-    if db_ok:
+    if os.getenv(DB_INITIALIZED_ENV) == "1":
+        logger.info("Database initialized by entrypoint")
+    elif init_db():
         logger.info("Database initialized")
     else:
         logger.warning("Database unavailable; app started in degraded mode")
@@ -80,6 +119,7 @@ async def lifespan(app: FastAPI):
     
     yield
     # Shutdown
+    await dispose_async_engine()
     logger.info("Application shutting down")
 
 
@@ -115,18 +155,21 @@ async def health_check():
 # ==================== Authentication ====================
 
 @app.post("/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
-    # Check if user exists
-    db_user = db.query(User).filter(User.username == user.username).first()
-    if db_user:
+    # Check username and email collisions in one round trip
+    taken = (await db.execute(
+        select(User.username, User.email).where(
+            or_(User.username == user.username, User.email == user.email)
+        )
+    )).all()
+    if any(row.username == user.username for row in taken):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
 
-    db_email = db.query(User).filter(User.email == user.email).first()
-    if db_email:
+    if taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -139,24 +182,32 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
 
     logger.info(f"User registered: {user.username}")
     return db_user
 
 
 @app.post("/token", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """Login and get JWT token"""
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = await db.scalar(select(User).where(User.username == form_data.username))
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = (
+        verify_and_update_password(form_data.password, user.hashed_password)
+        if user else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"}
         )
+    if new_hash:
+        # Migrate legacy hashes so later logins use the cheaper default scheme.
+        user.hashed_password = new_hash
+        await db.commit()
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -170,35 +221,27 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
 
 @app.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db)
+    user: User = Depends(get_current_user),
 ):
     """Get current user information"""
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
     return user
 
 
 @app.delete("/me")
 async def delete_my_account(
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete current user account and all owned submissions."""
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-
-    db.query(Submission).filter(Submission.user_id == user.id).delete()
-    db.delete(user)
-    db.commit()
+    owned_submissions = select(Submission.id).where(Submission.user_id == user.id)
+    await db.execute(
+        delete(SubmissionResult).where(
+            SubmissionResult.submission_id.in_(owned_submissions.scalar_subquery())
+        ).execution_options(synchronize_session=False)
+    )
+    await db.execute(delete(Submission).where(Submission.user_id == user.id))
+    await db.delete(user)
+    await db.commit()
 
     return {"message": "Account deleted successfully"}
 
@@ -209,15 +252,15 @@ async def delete_my_account(
 async def list_problems_api(
     difficulty: str | None = Query(default=None),
     tags: str | None = Query(default=None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """List all problems with optional difficulty/tags filtering."""
-    query = db.query(Problem).order_by(Problem.id.asc())
+    query = select(Problem).order_by(Problem.id.asc())
 
     if difficulty:
-        query = query.filter(Problem.difficulty == difficulty)
+        query = query.where(Problem.difficulty == difficulty)
 
-    problems = query.all()
+    problems = (await db.scalars(query)).all()
 
     if tags:
         requested_tags = {tag.strip().lower() for tag in tags.split(",") if tag.strip()}
@@ -230,13 +273,13 @@ async def list_problems_api(
                 )
             ]
 
-    return problems
+    return _list_response(_problems_adapter, problems)
 
 
 @app.get("/api/problems/{problem_id}", response_model=ProblemResponse)
-async def get_problem_api(problem_id: int, db: Session = Depends(get_db)):
+async def get_problem_api(problem_id: int, db: AsyncSession = Depends(get_db)):
     """Get one problem by id."""
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
+    problem = await db.get(Problem, problem_id)
     if not problem:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -245,6 +288,54 @@ async def get_problem_api(problem_id: int, db: Session = Depends(get_db)):
     return problem
 
 
+def _parse_testcase_value(raw: str) -> Any:
+    """Parse JSON in pydantic-core, falling back to the harness's literal parsing."""
+    try:
+        return _testcase_value_adapter.validate_json(raw)
+    except ValidationError:
+        return parse_value(raw)
+
+
+def _has_non_str_keys(value: Any) -> bool:
+    """True if any dict at any depth has a key JSON would coerce to a string."""
+    if isinstance(value, dict):
+        return any(
+            not isinstance(key, str) or _has_non_str_keys(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_str_keys(item) for item in value)
+    return False
+
+
+def _round_trips_as_json(value: Any) -> bool:
+    """True if storing `value` in a JSON column keeps what the harness compares."""
+    try:
+        json.dumps(value, allow_nan=False)
+    except (TypeError, ValueError):
+        return False
+    return not _has_non_str_keys(value)
+
+
+def _parse_testcase_values(testcase: TestCaseCreate) -> dict[str, Any] | None:
+    """
+    Parse testcase input/output once at write time for the judge harness,
+    tagging how the input is passed to `solution`. Returns None when the
+    values do not survive a JSON round trip (e.g. Python set literals, or
+    dicts with int keys); the harness then parses the raw text itself.
+    """
+    inp = _parse_testcase_value(testcase.input_data)
+    expected = _parse_testcase_value(testcase.expected_output)
+    # Check before tagging, so "kwargs" is only stored alongside the exact keys.
+    if not (_round_trips_as_json(inp) and _round_trips_as_json(expected)):
+        return None
+    return {
+        "call": call_style(inp),
+        "input": inp,
+        "expected": expected,
+    }
+
+
 def _is_system_design_problem(problem: Problem) -> bool:
     tags = [tag.lower() for tag in (problem.tags or []) if isinstance(tag, str)]
     return "system design" in tags or "architecture" in tags
@@ -350,18 +441,20 @@ def _build_problem_details(problem: Problem, testcases: list[TestCase]) -> dict[
 
 
 @app.get("/api/problems/{problem_id}/details")
-async def get_problem_details(problem_id: int, db: Session = Depends(get_db)):
+async def get_problem_details(problem_id: int, db: AsyncSession = Depends(get_db)):
     """Get rich details including examples, constraints, language support, and answer-key guidance."""
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
+    problem = await db.get(Problem, problem_id)
     if not problem:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Problem not found"
         )
-    testcases = db.query(TestCase).filter(
-        TestCase.problem_id == problem_id,
-        TestCase.is_hidden.is_(False),
-    ).order_by(TestCase.id.asc()).all()
+    testcases = (await db.scalars(
+        select(TestCase).where(
+            TestCase.problem_id == problem_id,
+            TestCase.is_hidden.is_(False),
+        ).order_by(TestCase.id.asc())
+    )).all()
     return _build_problem_details(problem, testcases)
 
 
@@ -369,33 +462,33 @@ async def get_problem_details(problem_id: int, db: Session = Depends(get_db)):
 async def list_problem_testcases(
     problem_id: int,
     include_hidden: bool = Query(default=False),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """List visible testcases for a problem, optionally including hidden cases."""
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
+    problem = await db.get(Problem, problem_id)
     if not problem:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Problem not found"
         )
 
-    query = db.query(TestCase).filter(TestCase.problem_id == problem_id)
+    query = select(TestCase).where(TestCase.problem_id == problem_id)
     if not include_hidden:
-        query = query.filter(TestCase.is_hidden.is_(False))
-    testcases = query.order_by(TestCase.id.asc()).all()
-    return testcases
+        query = query.where(TestCase.is_hidden.is_(False))
+    testcases = (await db.scalars(query.order_by(TestCase.id.asc()))).all()
+    return _list_response(_testcases_adapter, testcases)
 
 @app.get("/problems", response_model=list[ProblemResponse])
-async def list_problems(db: Session = Depends(get_db)):
+async def list_problems(db: AsyncSession = Depends(get_db)):
     """List all problems"""
-    problems = db.query(Problem).order_by(Problem.id.asc()).all()
-    return problems
+    problems = (await db.scalars(select(Problem).order_by(Problem.id.asc()))).all()
+    return _list_response(_problems_adapter, problems)
 
 
 @app.get("/problems/{problem_id}", response_model=ProblemResponse)
-async def get_problem(problem_id: int, db: Session = Depends(get_db)):
+async def get_problem(problem_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific problem"""
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
+    problem = await db.get(Problem, problem_id)
     if not problem:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -407,39 +500,29 @@ async def get_problem(problem_id: int, db: Session = Depends(get_db)):
 @app.post("/problems", response_model=ProblemResponse, status_code=status.HTTP_201_CREATED)
 async def create_problem(
     problem: ProblemCreate,
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new problem"""
-    current_user = db.query(User).filter(User.username == username).first()
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-
     db_problem = Problem(
         title=problem.title,
         description=problem.description,
         difficulty=problem.difficulty,
         tags=problem.tags,
-    )
-    db.add(db_problem)
-    db.commit()
-    db.refresh(db_problem)
-
-    if problem.test_cases:
-        testcases = [
+        testcases=[
             TestCase(
-                problem_id=db_problem.id,
                 input_data=test_case.input_data,
                 expected_output=test_case.expected_output,
                 is_hidden=test_case.is_hidden,
+                parsed_values=_parse_testcase_values(test_case),
             )
-            for test_case in problem.test_cases
-        ]
-        db.add_all(testcases)
-        db.commit()
+            for test_case in problem.test_cases or []
+        ],
+    )
+    # Problem and testcases are written in one transaction.
+    db.add(db_problem)
+    await db.commit()
+    await db.refresh(db_problem)
 
     logger.info(f"Problem created: {db_problem.id}")
     return db_problem
@@ -449,10 +532,10 @@ async def create_problem(
 async def update_problem(
     problem_id: int,
     problem_update: ProblemUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a problem"""
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
+    problem = await db.get(Problem, problem_id)
     if not problem:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -469,25 +552,25 @@ async def update_problem(
     if problem_update.tags is not None:
         problem.tags = problem_update.tags
 
-    db.commit()
-    db.refresh(problem)
+    await db.commit()
+    await db.refresh(problem)
 
     logger.info(f"Problem updated: {problem_id}")
     return problem
 
 
 @app.delete("/problems/{problem_id}")
-async def delete_problem(problem_id: int, db: Session = Depends(get_db)):
+async def delete_problem(problem_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a problem"""
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
+    problem = await db.get(Problem, problem_id)
     if not problem:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Problem not found"
         )
 
-    db.delete(problem)
-    db.commit()
+    await db.delete(problem)
+    await db.commit()
 
     return {"message": "Problem deleted successfully", "problem_id": problem_id}
 
@@ -496,17 +579,11 @@ async def delete_problem(problem_id: int, db: Session = Depends(get_db)):
 async def create_problem_testcase(
     problem_id: int,
     testcase: TestCaseCreate,
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a testcase for a problem."""
-    current_user = db.query(User).filter(User.username == username).first()
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
+    problem = await db.get(Problem, problem_id)
     if not problem:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -518,30 +595,35 @@ async def create_problem_testcase(
         input_data=testcase.input_data,
         expected_output=testcase.expected_output,
         is_hidden=testcase.is_hidden,
+        parsed_values=_parse_testcase_values(testcase),
     )
     db.add(db_testcase)
-    db.commit()
-    db.refresh(db_testcase)
+    await db.commit()
+    await db.refresh(db_testcase)
     return db_testcase
 
 
 @app.get("/problems/{problem_id}/discussions", response_model=list[DiscussionResponse])
-async def list_problem_discussions(problem_id: int, db: Session = Depends(get_db)):
+async def list_problem_discussions(problem_id: int, db: AsyncSession = Depends(get_db)):
     """List discussion comments for a problem."""
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
+    problem = await db.get(Problem, problem_id)
     if not problem:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Problem not found"
         )
 
-    discussions = db.query(Discussion).filter(
-        Discussion.problem_id == problem_id
-    ).order_by(Discussion.created_at.desc()).all()
+    discussions = (await db.scalars(
+        select(Discussion).options(
+            joinedload(Discussion.user)
+        ).where(
+            Discussion.problem_id == problem_id
+        ).order_by(Discussion.created_at.desc())
+    )).all()
 
     result: list[DiscussionResponse] = []
     for discussion in discussions:
-        user = db.query(User).filter(User.id == discussion.user_id).first()
+        user = discussion.user
         result.append(
             DiscussionResponse(
                 id=discussion.id,
@@ -559,17 +641,11 @@ async def list_problem_discussions(problem_id: int, db: Session = Depends(get_db
 async def create_problem_discussion(
     problem_id: int,
     payload: DiscussionCreate,
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a discussion comment on a problem."""
-    current_user = db.query(User).filter(User.username == username).first()
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
+    problem = await db.get(Problem, problem_id)
     if not problem:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -587,8 +663,8 @@ async def create_problem_discussion(
         content=payload.content.strip(),
     )
     db.add(discussion)
-    db.commit()
-    db.refresh(discussion)
+    await db.commit()
+    await db.refresh(discussion)
 
     return DiscussionResponse(
         id=discussion.id,
@@ -602,22 +678,23 @@ async def create_problem_discussion(
 
 # ==================== Submissions ====================
 
-@app.post("/problems/{problem_id}/submit", response_model=SubmissionResponse)
+@app.post(
+    "/problems/{problem_id}/submit",
+    response_model=SubmissionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def submit_solution(
     problem_id: int,
     submission: SubmissionCreate,
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Submit a solution to a problem"""
-    current_user = db.query(User).filter(User.username == username).first()
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    problem = db.query(Problem).filter(Problem.id == problem_id).first()
-    if not problem:
+    """Queue a solution for judging; poll GET /submissions/{id} for the verdict."""
+    problem_exists = await db.scalar(
+        select(exists().where(Problem.id == problem_id))
+    )
+    if not problem_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Problem not found"
@@ -637,9 +714,14 @@ async def submit_solution(
         status="queued",
     )
     db.add(db_submission)
-    db.commit()
-    db.refresh(db_submission)
-    execute_submission.delay(db_submission.id)
+    await db.commit()
+    await db.refresh(db_submission)
+    if celery.conf.task_always_eager:
+        # Without a broker Celery runs the task inline; judge after the
+        # response is sent instead of blocking the event loop.
+        background_tasks.add_task(execute_submission.delay, db_submission.id)
+    else:
+        execute_submission.delay(db_submission.id)
 
     logger.info(
         f"Submission created: {db_submission.id} "
@@ -651,38 +733,28 @@ async def submit_solution(
 
 @app.get("/submissions", response_model=list[SubmissionResponse])
 async def list_submissions(
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """List all submissions by current user"""
-    current_user = db.query(User).filter(User.username == username).first()
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    submissions = db.query(Submission).filter(
-        Submission.user_id == current_user.id
-    ).all()
-    return submissions
+    submissions = (await db.scalars(
+        select(Submission).where(Submission.user_id == current_user.id)
+    )).all()
+    return _list_response(_submissions_adapter, submissions)
 
 
 @app.get("/submissions/{submission_id}", response_model=SubmissionWithProblem)
 async def get_submission(
     submission_id: int,
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific submission"""
-    current_user = db.query(User).filter(User.username == username).first()
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    submission = db.query(Submission).filter(
-        Submission.id == submission_id
-    ).first()
+    submission = await db.scalar(
+        select(Submission).options(
+            joinedload(Submission.problem)
+        ).where(Submission.id == submission_id)
+    )
 
     if not submission:
         raise HTTPException(
@@ -699,46 +771,72 @@ async def get_submission(
     return submission
 
 
+@app.get("/submissions/{submission_id}/results", response_model=list[SubmissionResultResponse])
+async def list_submission_results(
+    submission_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """List per-testcase results for a submission"""
+    owner_id = await db.scalar(
+        select(Submission.user_id).where(Submission.id == submission_id)
+    )
+
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Submission not found"
+        )
+
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only view your own submissions"
+        )
+
+    results = (await db.scalars(
+        select(SubmissionResult).where(
+            SubmissionResult.submission_id == submission_id
+        ).order_by(SubmissionResult.idx)
+    )).all()
+    return _list_response(_submission_results_adapter, results)
+
+
 @app.get("/problems/{problem_id}/submissions", response_model=list[SubmissionResponse])
 async def list_problem_submissions(
     problem_id: int,
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """List all submissions for a problem by current user"""
-    current_user = db.query(User).filter(User.username == username).first()
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
+    submissions = (await db.scalars(
+        select(Submission).where(
+            Submission.problem_id == problem_id,
+            Submission.user_id == current_user.id
         )
-    submissions = db.query(Submission).filter(
-        Submission.problem_id == problem_id,
-        Submission.user_id == current_user.id
-    ).all()
-    return submissions
+    )).all()
+    return _list_response(_submissions_adapter, submissions)
 
 
 # ==================== Statistics ====================
 @app.get("/leaderboard", response_model=list[LeaderboardEntry])
-async def get_leaderboard(db: Session = Depends(get_db)):
+async def get_leaderboard(db: AsyncSession = Depends(get_db)):
     """Return global leaderboard ranked by solved problems and success rate."""
-    users = db.query(User).all()
+    is_passed = Submission.status.in_(PASSED_STATUSES)
+    rows = (await db.execute(
+        select(
+            User.id,
+            User.username,
+            func.count(Submission.id),
+            func.count(case((is_passed, Submission.id))),
+            func.count(distinct(case((is_passed, Submission.problem_id)))),
+        ).outerjoin(
+            Submission, Submission.user_id == User.id
+        ).group_by(User.id, User.username).order_by(User.id.asc())
+    )).all()
     entries: list[LeaderboardEntry] = []
 
-    for user in users:
-        total_submissions = db.query(Submission).filter(
-            Submission.user_id == user.id
-        ).count()
-        accepted_submissions = db.query(Submission).filter(
-            Submission.user_id == user.id,
-            or_(Submission.status == "accepted", Submission.status == "passed")
-        ).count()
-        solved_problems = db.query(Submission).filter(
-            Submission.user_id == user.id,
-            or_(Submission.status == "accepted", Submission.status == "passed")
-        ).distinct(Submission.problem_id).count()
-
+    for user_id, username, total_submissions, accepted_submissions, solved_problems in rows:
         success_rate = (
             (accepted_submissions / total_submissions) * 100
             if total_submissions > 0 else 0.0
@@ -746,8 +844,8 @@ async def get_leaderboard(db: Session = Depends(get_db)):
 
         entries.append(
             LeaderboardEntry(
-                user_id=user.id,
-                username=user.username,
+                user_id=user_id,
+                username=username,
                 solved_problems=solved_problems,
                 total_submissions=total_submissions,
                 accepted_submissions=accepted_submissions,
@@ -768,29 +866,18 @@ async def get_leaderboard(db: Session = Depends(get_db)):
 
 @app.get("/stats")
 async def get_stats(
-    username: str = Depends(get_current_username_from_token),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get user statistics"""
-    current_user = db.query(User).filter(User.username == username).first()
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    total_submissions = db.query(Submission).filter(
-        Submission.user_id == current_user.id
-    ).count()
-
-    passed_submissions = db.query(Submission).filter(
-        Submission.user_id == current_user.id,
-        or_(Submission.status == "accepted", Submission.status == "passed")
-    ).count()
-
-    unique_problems_solved = db.query(Submission).filter(
-        Submission.user_id == current_user.id,
-        or_(Submission.status == "accepted", Submission.status == "passed")
-    ).distinct(Submission.problem_id).count()
+    is_passed = Submission.status.in_(PASSED_STATUSES)
+    total_submissions, passed_submissions, unique_problems_solved = (await db.execute(
+        select(
+            func.count(Submission.id),
+            func.count(case((is_passed, Submission.id))),
+            func.count(distinct(case((is_passed, Submission.problem_id)))),
+        ).where(Submission.user_id == current_user.id)
+    )).one()
 
     return {
         "total_submissions": total_submissions,
@@ -802,9 +889,23 @@ async def get_stats(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "app:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
-    )
+
+    if os.getenv("ENV") == "dev":
+        uvicorn.run(
+            "app:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True
+        )
+    else:
+        workers = int(os.getenv("WORKERS", str(os.cpu_count() or 1)))
+        if workers > 1 and init_db():
+            # Create and seed once here; workers inherit the flag and skip it.
+            os.environ[DB_INITIALIZED_ENV] = "1"
+        # uvicorn[standard] picks uvloop and httptools automatically.
+        uvicorn.run(
+            "app:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=workers,
+        )
@@ -1,19 +1,32 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+import functools
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 
+from database import get_db
+from models import User
+
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# pbkdf2_sha256 cost; passlib's default is 29000 rounds.
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+
 # Use pbkdf2_sha256 as default to avoid bcrypt backend incompatibilities.
 # Keep bcrypt in verify path for backward compatibility with older hashes.
-pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256", "bcrypt"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=PASSWORD_HASH_ROUNDS,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
 
@@ -22,6 +35,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify password and return a replacement hash when the stored one uses a
+    deprecated scheme (e.g. legacy bcrypt), so it is only re-hashed once.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash password"""
     return pwd_context.hash(password)
@@ -40,6 +61,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+@functools.lru_cache(maxsize=10_000)
+def _decode_token(token: str) -> tuple[Optional[str], Optional[float]]:
+    """
+    Verify a token signature once and cache its (username, exp) claims.
+    Invalid tokens raise JWTError and are not cached. Expiry is re-checked by
+    the caller on every lookup, so cached entries never outlive the token.
+    An asymmetric (RS256/JWKS) setup would resolve its signing key here, with
+    the key client created once at import time.
+    """
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = payload.get("exp")
+    return payload.get("sub"), float(exp) if exp is not None else None
+
+
 def get_current_username_from_token(token: str = Depends(oauth2_scheme)) -> str:
     """Extract username from JWT token"""
     credential_exception = HTTPException(
@@ -48,12 +83,28 @@ def get_current_username_from_token(token: str = Depends(oauth2_scheme)) -> str:
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credential_exception
+        username, exp = _decode_token(token)
     except JWTError:
         raise credential_exception
+    if username is None or (exp is not None and exp <= time.time()):
+        raise credential_exception
 
     return username
 
+
+async def get_current_user(
+    username: str = Depends(get_current_username_from_token),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Resolve the authenticated user with a single query.
+    FastAPI caches dependencies per request, so endpoints sharing this
+    dependency never fetch the row twice.
+    """
+    user = await db.scalar(select(User).where(User.username == username))
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return user
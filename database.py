@@ -1,18 +1,37 @@
 import logging
+import os
+from typing import AsyncIterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.engine import URL
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from config import DATABASE_URL
 from models import Base, Problem
 
 logger = logging.getLogger(__name__)
 
+# Sync sessions serve Celery tasks and startup seeding; API handlers use the
+# async sessions below so database I/O does not block the event loop.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+# Handlers serialize ORM objects after commit; expiring them would force a
+# lazy reload, which AsyncSession cannot do implicitly.
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 _engine = None
+_async_engine = None
 _db_ready = False
 
+IN_MEMORY_SQLITE_URL = "sqlite:///:memory:"
+# Named shared-cache database so the sync and async engines see the same data.
+SHARED_MEMORY_SQLITE_URL = "sqlite:///file:cloudjudge?mode=memory&cache=shared&uri=true"
+
 
 def _build_seed_problems() -> list[dict[str, object]]:
     coding_topics = [
@@ -110,15 +129,65 @@ def seed_problems() -> None:
         db.close()
 
 
+def _engine_kwargs() -> dict[str, object]:
+    """Pool settings for the configured backend; server pools are sized from env."""
+    kwargs: dict[str, object] = {"pool_pre_ping": True}
+    if DATABASE_URL.startswith("sqlite"):
+        # Sessions are handed across FastAPI's threadpool and Celery threads.
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if DATABASE_URL == IN_MEMORY_SQLITE_URL:
+            # Keep one connection open so the in-memory database outlives sessions.
+            kwargs["poolclass"] = StaticPool
+        return kwargs
+
+    kwargs.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE_SECONDS", "3600")),
+    )
+    return kwargs
+
+
+def _sync_database_url() -> URL:
+    if DATABASE_URL == IN_MEMORY_SQLITE_URL:
+        return make_url(SHARED_MEMORY_SQLITE_URL)
+    return make_url(DATABASE_URL)
+
+
+def _async_database_url() -> URL:
+    """Point DATABASE_URL at the asyncio driver for the same backend."""
+    url = _sync_database_url()
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url.set(drivername="postgresql+psycopg")
+
+
 def get_engine():
     """Create SQLAlchemy engine lazily and bind sessionmaker once."""
     global _engine
     if _engine is None:
-        _engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+        _engine = create_engine(_sync_database_url(), **_engine_kwargs())
         SessionLocal.configure(bind=_engine)
     return _engine
 
 
+def get_async_engine() -> AsyncEngine:
+    """Create the asyncio engine lazily and bind the async sessionmaker once."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(_async_database_url(), **_engine_kwargs())
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled asyncio connections on application shutdown."""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
 def is_db_ready() -> bool:
     """Return last known database initialization state."""
     return _db_ready
@@ -142,11 +211,8 @@ def init_db() -> bool:
         return False
 
 
-def get_db() -> Session:
+async def get_db() -> AsyncIterator[AsyncSession]:
     """Get database session"""
-    get_engine()
-    db = SessionLocal()
-    try:
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
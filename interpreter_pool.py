@@ -0,0 +1,171 @@
+import atexit
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Idle interpreters apply their resource limits, then block on stdin until a
+# length-prefixed runner script arrives and run it as __main__; anything after
+# the script is left on stdin for the runner. Interpreter startup happens while
+# the process sits in the pool. Limits are set here rather than via preexec_fn,
+# which is unsafe while testcase shards spawn interpreters from threads.
+BOOTSTRAP_TEMPLATE = """
+import sys
+try:
+    import resource
+except ImportError:
+    resource = None
+if resource is not None:
+    for name, value in {limits!r}:
+        limit = getattr(resource, name)
+        hard = resource.getrlimit(limit)[1]
+        if hard != resource.RLIM_INFINITY:
+            value = min(value, hard)
+        resource.setrlimit(limit, (value, value))
+src = sys.stdin.read(int(sys.stdin.readline()))
+exec(compile(src, '<runner>', 'exec'), {{'__name__': '__main__'}})
+"""
+
+
+def _resource_limits() -> list[tuple[str, int]]:
+    timeout_seconds = int(os.getenv("LOCAL_EXECUTION_TIMEOUT_SECONDS", "8"))
+    memory_mb = int(os.getenv("LOCAL_EXECUTION_MEMORY_MB", "256"))
+    max_processes = int(os.getenv("LOCAL_EXECUTION_MAX_PROCESSES", "0"))
+
+    # CPU limit backs up the wall-clock timeout for busy loops.
+    limits = [("RLIMIT_CPU", timeout_seconds + 1)]
+    if memory_mb > 0:
+        limits.append(("RLIMIT_AS", memory_mb * 1024 * 1024))
+    if max_processes > 0:
+        limits.append(("RLIMIT_NPROC", max_processes))
+    return limits
+
+
+def _interpreter_command() -> list[str]:
+    """
+    Build the pooled interpreter argv. LOCAL_EXECUTION_SANDBOX=nsjail runs
+    each interpreter inside nsjail using NSJAIL_CONFIG.
+    """
+    bootstrap = BOOTSTRAP_TEMPLATE.format(limits=_resource_limits())
+    sandbox = os.getenv("LOCAL_EXECUTION_SANDBOX", "none").strip().lower()
+    if sandbox == "nsjail":
+        return [
+            os.getenv("NSJAIL_PATH", "nsjail"),
+            "--config",
+            os.getenv("NSJAIL_CONFIG", "/etc/judge.cfg"),
+            "--",
+            os.getenv("NSJAIL_PYTHON", "/usr/bin/python3"),
+            "-X",
+            "utf8",
+            "-c",
+            bootstrap,
+        ]
+    if sandbox != "none":
+        raise RuntimeError(
+            "Invalid LOCAL_EXECUTION_SANDBOX. Expected one of: 'none', 'nsjail'."
+        )
+    return [sys.executable, "-X", "utf8", "-c", bootstrap]
+
+
+class InterpreterPool:
+    """
+    Keep a few Python interpreters started ahead of time for local execution.
+    Every interpreter runs exactly one script and exits, so submissions never
+    share process state; acquiring one spawns its replacement.
+    """
+
+    def __init__(self, size: int, command: list[str]):
+        self.size = max(size, 0)
+        self.command = command
+        self._idle: queue.Queue[subprocess.Popen] = queue.Queue()
+        self._refill_lock = threading.Lock()
+        self._closed = False
+
+    def _spawn(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+        )
+
+    def _acquire(self) -> subprocess.Popen:
+        while True:
+            try:
+                proc = self._idle.get_nowait()
+            except queue.Empty:
+                proc = self._spawn()
+                break
+            if proc.poll() is None:
+                break
+        with self._refill_lock:
+            while not self._closed and self._idle.qsize() < self.size:
+                self._idle.put(self._spawn())
+        return proc
+
+    def run(
+        self,
+        script: str,
+        timeout: float,
+        input: str = "",
+    ) -> subprocess.CompletedProcess:
+        """
+        Run `script` in a warm interpreter with `subprocess.run` semantics.
+        `input` is what the script sees on its own stdin.
+        """
+        # The child's text-mode stdin translates newlines, which would skew the
+        # length prefix for sources saved with CRLF line endings.
+        script = script.replace("\r\n", "\n").replace("\r", "\n")
+        proc = self._acquire()
+        try:
+            stdout, stderr = proc.communicate(
+                input=f"{len(script)}\n{script}{input}",
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired as exc:
+            proc.kill()
+            exc.stdout, exc.stderr = proc.communicate()
+            raise
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        return subprocess.CompletedProcess(proc.args, proc.returncode, stdout, stderr)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                proc = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                proc.kill()
+                proc.wait(timeout=1)
+            except Exception:
+                logger.warning("Failed to stop pooled interpreter pid=%s", proc.pid)
+
+
+_pool: InterpreterPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def get_interpreter_pool() -> InterpreterPool:
+    """
+    Return this process's interpreter pool, creating it on first use.
+    The pid check keeps forked Celery workers from reusing the parent's pool.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            size = int(os.getenv("LOCAL_EXECUTION_POOL_SIZE", "2"))
+            _pool = InterpreterPool(size, _interpreter_command())
+            _pool_pid = os.getpid()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,100 @@
+"""
+Testcase harness executed inside the local judging interpreter.
+
+The source of this module is sent to the interpreter as-is; the submission
+code and its testcases follow on stdin as one JSON document, so nothing here
+is rendered per submission. Keep it stdlib-only: the API also imports
+`parse_value` and `call_style` to pre-parse testcases when they are written.
+"""
+import ast
+import json
+import sys
+import time
+
+# Prefixes the summary line so output printed by the submission is ignored.
+RESULT_MARKER = "__CJ_RESULT__="
+
+
+def parse_value(raw):
+    if raw is None:
+        return None
+    raw = str(raw).strip()
+    if raw == "":
+        return ""
+    for parser in (json.loads, ast.literal_eval):
+        try:
+            return parser(raw)
+        except Exception:
+            pass
+    return raw
+
+
+def normalize(value):
+    if isinstance(value, (dict, list, tuple, int, float, bool)) or value is None:
+        try:
+            return json.dumps(value, sort_keys=True)
+        except Exception:
+            return str(value).strip()
+    return str(value).strip()
+
+
+def call_style(value):
+    """Tag how a testcase input is passed to `solution`."""
+    if isinstance(value, dict):
+        return "kwargs"
+    if isinstance(value, (list, tuple)):
+        return "args"
+    return "single"
+
+
+def invoke(solution, call, inp):
+    if call == "kwargs":
+        return solution(**inp)
+    if call == "args":
+        return solution(*inp)
+    return solution(inp)
+
+
+def main():
+    payload = json.load(sys.stdin)
+    cases = payload["cases"]
+    ns = {}
+    exec(compile(payload["code"], "<submission>", "exec"), ns, ns)
+    solution = ns.get("solution")
+    if not callable(solution):
+        raise RuntimeError("Define a callable function named 'solution'.")
+
+    passed = 0
+    total = len(cases)
+    details = []
+    started = time.perf_counter()
+    for position, case in enumerate(cases, start=1):
+        parsed = case.get("parsed")
+        if parsed is not None:
+            inp, exp = parsed["input"], parsed["expected"]
+            call = parsed.get("call") or call_style(inp)
+        else:
+            inp = parse_value(case.get("input_data"))
+            exp = parse_value(case.get("expected_output"))
+            call = call_style(inp)
+
+        out = invoke(solution, call, inp)
+
+        ok = normalize(out) == normalize(exp)
+        if ok:
+            passed += 1
+        details.append({"index": case.get("index", position), "passed": ok, "actual": out, "expected": exp})
+
+    runtime_ms = int((time.perf_counter() - started) * 1000)
+    status = "accepted" if passed == total else "wrong_answer"
+    print("\n" + RESULT_MARKER + json.dumps({
+        "status": status,
+        "passed_test_cases": passed,
+        "total_test_cases": total,
+        "details": details,
+        "runtime_ms": runtime_ms
+    }, separators=(",", ":")))
+
+
+if __name__ == "__main__":
+    main()
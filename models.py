@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -39,35 +39,63 @@ class TestCase(Base):
     __tablename__ = "testcases"
 
     id = Column(Integer, primary_key=True, index=True)
-    problem_id = Column(Integer, ForeignKey("problems.id"), nullable=False)
+    problem_id = Column(Integer, ForeignKey("problems.id"), nullable=False, index=True)
     input_data = Column(Text, nullable=False)
     expected_output = Column(Text, nullable=False)
     is_hidden = Column(Boolean, default=True)
+    # {"input": ..., "expected": ...} parsed at write time; NULL for legacy rows.
+    parsed_values = Column(JSON(none_as_null=True), nullable=True)
 
     problem = relationship("Problem", back_populates="testcases")
 
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        # Per-user stats/leaderboard aggregates and per-problem history lookups.
+        Index("ix_submissions_user_id_status", "user_id", "status"),
+        Index("ix_submissions_user_id_problem_id", "user_id", "problem_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    problem_id = Column(Integer, ForeignKey("problems.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    problem_id = Column(Integer, ForeignKey("problems.id"), nullable=False, index=True)
     code = Column(Text, nullable=False)
     status = Column(String, default="queued")  # queued, running, accepted, wrong_answer, error
     runtime_ms = Column(Integer, nullable=True)
-    result = Column(Text)  # JSON output
+    result = Column(Text)  # JSON execution summary; per-testcase rows live in submission_results
     created_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="submissions")
     problem = relationship("Problem", back_populates="submissions")
+    results = relationship("SubmissionResult", back_populates="submission", order_by="SubmissionResult.idx")
+
+
+class SubmissionResult(Base):
+    __tablename__ = "submission_results"
+
+    id = Column(Integer, primary_key=True, index=True)
+    submission_id = Column(
+        Integer,
+        ForeignKey("submissions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    idx = Column(Integer, nullable=False)  # 1-based testcase position
+    passed = Column(Boolean, nullable=False)
+    # JSON-encoded text: a JSON column would get NUMERIC affinity on SQLite, which
+    # turns bare >64-bit integers into floats, and PostgreSQL rejects NaN/Infinity.
+    actual_output = Column(Text, nullable=True)
+    expected_output = Column(Text, nullable=True)
+
+    submission = relationship("Submission", back_populates="results")
 
 
 class Discussion(Base):
     __tablename__ = "discussions"
 
     id = Column(Integer, primary_key=True, index=True)
-    problem_id = Column(Integer, ForeignKey("problems.id"), nullable=False)
+    problem_id = Column(Integer, ForeignKey("problems.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
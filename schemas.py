@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, Literal
+from pydantic import BaseModel, EmailStr, Json
+from typing import Any, Optional, Literal
 from datetime import datetime
 
 
@@ -80,6 +80,18 @@ class SubmissionWithProblem(SubmissionResponse):
     problem: ProblemResponse
 
 
+class SubmissionResultResponse(BaseModel):
+    idx: int
+    passed: bool
+    actual_output: Optional[Json[Any]] = None
+    expected_output: Optional[Json[Any]] = None
+
+    class Config:
+        from_attributes = True
+        # Non-finite answers are returned as "Infinity"/"NaN" rather than null.
+        ser_json_inf_nan = "strings"
+
+
 class TestCaseBase(BaseModel):
     input_data: str
     expected_output: str
@@ -1,21 +1,26 @@
 import logging
 import json
-import base64
 import os
 import subprocess
-import sys
-import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+import orjson
 from celery.exceptions import SoftTimeLimitExceeded
+from sqlalchemy import insert
 from azure_executor import run_submission_in_aci
 from celery_app import celery
 from database import SessionLocal
-from models import Submission, TestCase
+from interpreter_pool import get_interpreter_pool
+from judge_harness import RESULT_MARKER
+from models import Submission, SubmissionResult, TestCase
 from redis_client import invalidate_leaderboard_cache
 
 logger = logging.getLogger(__name__)
 
+HARNESS_SOURCE = Path(__file__).with_name("judge_harness.py").read_text(encoding="utf-8")
+
 
 def _run_submission_locally(code: str) -> dict[str, object]:
     """
@@ -24,24 +29,9 @@ def _run_submission_locally(code: str) -> dict[str, object]:
     """
     timeout_seconds = int(os.getenv("LOCAL_EXECUTION_TIMEOUT_SECONDS", "8"))
     started_at = time.perf_counter()
-    file_path = None
 
     try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            suffix=".py",
-            delete=False,
-            encoding="utf-8",
-        ) as tmp_file:
-            tmp_file.write(code)
-            file_path = tmp_file.name
-
-        proc = subprocess.run(
-            [sys.executable, file_path],
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds,
-        )
+        proc = get_interpreter_pool().run(code, timeout=timeout_seconds)
         runtime_ms = int((time.perf_counter() - started_at) * 1000)
         status = "accepted" if proc.returncode == 0 else "error"
         return {
@@ -80,12 +70,40 @@ def _run_submission_locally(code: str) -> dict[str, object]:
             "container_state": "local-fallback",
             "detail": f"Local execution failure: {exc}",
         }
-    finally:
-        if file_path:
-            try:
-                os.remove(file_path)
-            except Exception:
-                logger.warning("Failed to remove temporary execution file: %s", file_path)
+
+
+def _split_cases(cases: list[dict[str, object]], parts: int) -> list[list[dict[str, object]]]:
+    """Split testcases into at most `parts` contiguous, order-preserving shards."""
+    size = -(-len(cases) // parts)
+    return [cases[start:start + size] for start in range(0, len(cases), size)]
+
+
+def _dump_harness_payload(payload: dict[str, object]) -> str:
+    try:
+        return orjson.dumps(payload).decode("utf-8")
+    except TypeError:
+        # orjson rejects integers wider than 64 bits; testcases may hold bigger ones.
+        return json.dumps(payload, separators=(",", ":"))
+
+
+def _parse_harness_result(stdout: str) -> dict[str, object]:
+    """
+    Decode only the harness summary line; anything the submission printed is
+    skipped. The harness writes it with stdlib json, so it is read back the
+    same way: orjson rejects NaN/Infinity and turns >64-bit ints into floats.
+    """
+    start = stdout.rfind(RESULT_MARKER)
+    if start < 0:
+        return {}
+    return json.loads(stdout[start + len(RESULT_MARKER):].partition("\n")[0])
+
+
+def _strip_harness_result(stdout: str) -> str:
+    """Return what the submission printed, without the harness summary line."""
+    start = stdout.rfind(RESULT_MARKER)
+    if start < 0:
+        return stdout
+    return stdout[:start].removesuffix("\n")
 
 
 def _run_submission_with_testcases_locally(
@@ -93,120 +111,76 @@ def _run_submission_with_testcases_locally(
     testcases: list[TestCase],
 ) -> dict[str, object]:
     """
-    Execute user code against stored testcases in a local subprocess.
+    Execute user code against stored testcases in local subprocesses.
+    Testcases are sharded across warm interpreters, so the interpreter pool
+    size bounds how many run concurrently.
     Expected contract: user defines a callable named `solution`.
     """
     timeout_seconds = int(os.getenv("LOCAL_EXECUTION_TIMEOUT_SECONDS", "8"))
     started_at = time.perf_counter()
 
+    pool = get_interpreter_pool()
     case_payload = [
-        {"input_data": case.input_data, "expected_output": case.expected_output}
-        for case in testcases
+        {
+            "index": idx,
+            "input_data": case.input_data,
+            "expected_output": case.expected_output,
+            "parsed": case.parsed_values,
+        }
+        for idx, case in enumerate(testcases, start=1)
     ]
-    code_b64 = base64.b64encode(code.encode("utf-8")).decode("ascii")
-    cases_b64 = base64.b64encode(
-        json.dumps(case_payload, separators=(",", ":")).encode("utf-8")
-    ).decode("ascii")
+    shard_count = min(len(case_payload), max(pool.size, 1), os.cpu_count() or 1)
+    shards = _split_cases(case_payload, shard_count)
 
-    runner = f"""
-import ast
-import base64
-import json
-import sys
-import time
-
-def parse_value(raw):
-    if raw is None:
-        return None
-    raw = str(raw).strip()
-    if raw == "":
-        return ""
-    for parser in (json.loads, ast.literal_eval):
-        try:
-            return parser(raw)
-        except Exception:
-            pass
-    return raw
-
-def normalize(value):
-    if isinstance(value, (dict, list, tuple, int, float, bool)) or value is None:
-        try:
-            return json.dumps(value, sort_keys=True)
-        except Exception:
-            return str(value).strip()
-    return str(value).strip()
-
-code = base64.b64decode("{code_b64}").decode("utf-8")
-cases = json.loads(base64.b64decode("{cases_b64}").decode("utf-8"))
-ns = {{}}
-exec(code, ns, ns)
-solution = ns.get("solution")
-if not callable(solution):
-    raise RuntimeError("Define a callable function named 'solution'.")
-
-passed = 0
-total = len(cases)
-details = []
-started = time.perf_counter()
-for idx, case in enumerate(cases, start=1):
-    inp = parse_value(case.get("input_data"))
-    exp = parse_value(case.get("expected_output"))
-
-    if isinstance(inp, dict):
-        out = solution(**inp)
-    elif isinstance(inp, (list, tuple)):
-        out = solution(*inp)
-    else:
-        out = solution(inp)
-
-    ok = normalize(out) == normalize(exp)
-    if ok:
-        passed += 1
-    details.append({{"index": idx, "passed": ok, "actual": out, "expected": exp}})
-
-runtime_ms = int((time.perf_counter() - started) * 1000)
-status = "accepted" if passed == total else "wrong_answer"
-print(json.dumps({{
-    "status": status,
-    "passed_test_cases": passed,
-    "total_test_cases": total,
-    "details": details,
-    "runtime_ms": runtime_ms
-}}, separators=(",", ":")))
-""".strip()
+    def run_shard(cases: list[dict[str, object]]):
+        payload = _dump_harness_payload({"code": code, "cases": cases})
+        return pool.run(HARNESS_SOURCE, timeout=timeout_seconds, input=payload)
 
     try:
-        proc = subprocess.run(
-            [sys.executable, "-c", runner],
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds,
-        )
+        if len(shards) == 1:
+            procs = [run_shard(shards[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                procs = list(executor.map(run_shard, shards))
         runtime_ms = int((time.perf_counter() - started_at) * 1000)
-        if proc.returncode != 0:
+        stdout = "".join(proc.stdout or "" for proc in procs)
+        stderr = "".join(proc.stderr or "" for proc in procs)
+        failed = next((proc for proc in procs if proc.returncode != 0), None)
+        if failed is not None:
             return {
                 "status": "error",
-                "stdout": proc.stdout or "",
-                "stderr": proc.stderr or "",
-                "exit_code": int(proc.returncode),
+                "stdout": stdout,
+                "stderr": stderr,
+                "exit_code": int(failed.returncode),
                 "runtime_ms": runtime_ms,
                 "timed_out": False,
                 "container_state": "local-testcase-fallback",
                 "detail": "Execution failed while running testcase evaluator.",
             }
 
-        payload = json.loads((proc.stdout or "{}").strip() or "{}")
+        payloads = [_parse_harness_result(proc.stdout or "") for proc in procs]
+        statuses = {payload.get("status", "error") for payload in payloads}
+        if "error" in statuses:
+            status = "error"
+        elif statuses == {"accepted"}:
+            status = "accepted"
+        else:
+            status = "wrong_answer"
         return {
-            "status": payload.get("status", "error"),
-            "stdout": proc.stdout or "",
-            "stderr": proc.stderr or "",
-            "exit_code": int(proc.returncode),
-            "runtime_ms": int(payload.get("runtime_ms", runtime_ms)),
+            "status": status,
+            "stdout": "".join(_strip_harness_result(proc.stdout or "") for proc in procs),
+            "stderr": stderr,
+            "exit_code": 0,
+            "runtime_ms": max(int(payload.get("runtime_ms", runtime_ms)) for payload in payloads),
             "timed_out": False,
             "container_state": "local-testcase-fallback",
             "detail": "",
-            "passed_test_cases": int(payload.get("passed_test_cases", 0)),
-            "total_test_cases": int(payload.get("total_test_cases", len(testcases))),
+            "passed_test_cases": sum(int(payload.get("passed_test_cases", 0)) for payload in payloads),
+            "total_test_cases": sum(
+                int(payload.get("total_test_cases", len(cases)))
+                for payload, cases in zip(payloads, shards)
+            ),
+            "details": [detail for payload in payloads for detail in payload.get("details", [])],
         }
     except subprocess.TimeoutExpired as exc:
         runtime_ms = int((time.perf_counter() - started_at) * 1000)
@@ -273,7 +247,7 @@ def execute_submission(self, submission_id: int):
         runtime_ms = int(execution.get("runtime_ms") or ((time.perf_counter() - started_at) * 1000))
         submission.status = final_status
         submission.runtime_ms = runtime_ms
-        submission.result = json.dumps(
+        submission.result = orjson.dumps(
             {
                 "stdout": execution.get("stdout", ""),
                 "stderr": execution.get("stderr", ""),
@@ -283,7 +257,19 @@ def execute_submission(self, submission_id: int):
                 "passed_test_cases": execution.get("passed_test_cases"),
                 "total_test_cases": execution.get("total_test_cases"),
             }
-        )
+        ).decode("utf-8")
+        result_rows = [
+            {
+                "submission_id": submission_id,
+                "idx": int(detail["index"]),
+                "passed": bool(detail.get("passed")),
+                "actual_output": json.dumps(detail.get("actual")),
+                "expected_output": json.dumps(detail.get("expected")),
+            }
+            for detail in execution.get("details") or []
+        ]
+        if result_rows:
+            db.execute(insert(SubmissionResult), result_rows)
         db.commit()
         if final_status == "accepted":
             invalidate_leaderboard_cache()
@@ -69,4 +69,64 @@ curl -s -X GET "$BASE_URL/stats" \
   -H "Authorization: Bearer $TOKEN" | python -m json.tool
 echo ""
 
+# 9. Numeric edge cases (regression: NaN/Infinity and >64-bit results)
+echo "9. Submit Solution With Non-Finite And Big-Integer Answers:"
+EDGE_PROBLEM_ID=$(curl -s -X POST "$BASE_URL/problems" \
+  -H "Authorization: Bearer $TOKEN" \
+  -H "Content-Type: application/json" \
+  -d '{
+    "title": "Numeric Edge Cases",
+    "description": "Return inf, nan or a 30-digit integer",
+    "difficulty": "Easy",
+    "test_cases": [
+      {"input_data": "0", "expected_output": "Infinity"},
+      {"input_data": "1", "expected_output": "NaN"},
+      {"input_data": "2", "expected_output": "123456789012345678901234567890"}
+    ]
+  }' | python -c "import sys, json; print(json.load(sys.stdin)['id'])")
+EDGE_SUBMISSION_ID=$(curl -s -X POST "$BASE_URL/problems/$EDGE_PROBLEM_ID/submit" \
+  -H "Authorization: Bearer $TOKEN" \
+  -H "Content-Type: application/json" \
+  -d '{
+    "code": "def solution(x):\n    return [float(\"inf\"), float(\"nan\"), 123456789012345678901234567890][x]"
+  }' | python -c "import sys, json; print(json.load(sys.stdin)['id'])")
+sleep 3
+echo "Expected status: accepted"
+curl -s -X GET "$BASE_URL/submissions/$EDGE_SUBMISSION_ID" \
+  -H "Authorization: Bearer $TOKEN" | python -c "import sys, json; print('Status:', json.load(sys.stdin)['status'])"
+echo ""
+
+# 10. Dict answers with int keys (regression: JSON would turn keys into strings)
+echo "10. Submit Solution With Int-Keyed Dict Answer:"
+INT_KEY_PROBLEM_ID=$(curl -s -X POST "$BASE_URL/problems" \
+  -H "Authorization: Bearer $TOKEN" \
+  -H "Content-Type: application/json" \
+  -d '{
+    "title": "Int Keyed Dict",
+    "description": "Return a dict keyed by integers",
+    "difficulty": "Easy",
+    "test_cases": [
+      {"input_data": "0", "expected_output": "{9: '"'"'a'"'"', 10: '"'"'b'"'"'}"}
+    ]
+  }' | python -c "import sys, json; print(json.load(sys.stdin)['id'])")
+INT_KEY_SUBMISSION_ID=$(curl -s -X POST "$BASE_URL/problems/$INT_KEY_PROBLEM_ID/submit" \
+  -H "Authorization: Bearer $TOKEN" \
+  -H "Content-Type: application/json" \
+  -d '{
+    "code": "def solution(s):\n    return {9: \"a\", 10: \"b\"}"
+  }' | python -c "import sys, json; print(json.load(sys.stdin)['id'])")
+sleep 3
+echo "Expected status: accepted"
+curl -s -X GET "$BASE_URL/submissions/$INT_KEY_SUBMISSION_ID" \
+  -H "Authorization: Bearer $TOKEN" | python -c "import sys, json; print('Status:', json.load(sys.stdin)['status'])"
+echo ""
+
+# 11. Per-testcase results keep the exact answers
+echo "11. Get Submission Results:"
+echo 'Expected outputs: "Infinity", "NaN", 123456789012345678901234567890'
+curl -s -X GET "$BASE_URL/submissions/$EDGE_SUBMISSION_ID/results" \
+  -H "Authorization: Bearer $TOKEN"
+echo ""
+echo ""
+
 echo "==== Test Complete ===="